@@ -11,7 +11,10 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from lightrag import LightRAG
 from lightrag.llm.openai import gpt_4o_mini_complete, openai_embed
 import re
+import mmap
 import logging
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -23,95 +26,308 @@ TXT_PATH = "/Users/dongqing/Documents/phd/LightRAG/examples/edges_with_keywords_
 if not os.path.exists(WORKING_DIR):
     os.mkdir(WORKING_DIR)
 
-def parse_kg_from_txt(txt_path):
+# 小于该大小的文件直接在当前进程解析，进程池的启动开销大于并行收益
+PARALLEL_MIN_FILE_SIZE = 16 * 1024 * 1024
+
+# 预编译正则（模块加载时编译一次；均为字节模式，直接作用于 mmap）
+CHUNK_RE = re.compile(rb'No\.: (\d+) of all the chunks')
+NON_BLANK_RE = re.compile(rb'\S')
+# 原始文本截止到 token 统计、模型输出或 chunk 末尾，用字面量查找定位
+ORIG_TEXT_MARKER = b'original text:'
+ORIG_TEXT_TERMINATORS = (b'total tokens:', b'deepseek-v3 output:')
+# 记录以固定前缀开头、以 | 分隔字段：两种前缀合并为一个模式单遍定位，字段直接用 find / split 解析
+RECORD_OPENER_RE = re.compile(rb'\("(entity|relationship)"\s*\|')
+WHITESPACE = frozenset(b' \t\n\r\x0b\x0c')
+OPEN_PAREN, CLOSE_PAREN, NEWLINE = ord('('), ord(')'), ord('\n')
+
+
+def _decode(raw):
     """
-    从 TXT 文件中解析知识图谱数据（包含关键词的关系）
+    将原始字节解码为文本，并与文本模式读取一致地把 CRLF 统一为 LF
+    """
+    return raw.decode('utf-8').replace('\r\n', '\n')
+
+
+def _closes_record(buf, k, end):
+    """
+    判断 buf[k] 处的 ) 能否结束实体记录：其后只跟空白直到行尾 / chunk 末尾，或紧接下一个 (
+    """
+    q = k + 1
+    while q < end and buf[q] in WHITESPACE and buf[q] != NEWLINE:
+        q += 1
+    return q == end or buf[q] == NEWLINE or buf[q] == OPEN_PAREN
+
+
+def _parse_entity_fields(buf, pos, end):
+    """
+    解析 ("entity"|NAME|TYPE|DESCRIPTION) 的字段部分，不越过所在 chunk 的结束位置 end
     
-    返回格式：
-    {
-        "entities": [{"entity_name": ..., "entity_type": ..., "description": ..., "source_id": ...}],
-        "relationships": [{"src_id": ..., "tgt_id": ..., "description": ..., "keywords": ..., "weight": ..., "source_id": ...}],
-        "chunks": [{"content": ..., "source_id": ..., "source_chunk_index": ...}]
+    描述可以包含 | 和 )，但不能跨行（可以从第二个 | 之后的下一行开始）；记录在描述所在行中
+    满足结尾条件的第一个 ) 处结束，行内没有时，也可以由其后（跳过空行和空白）的第一个 ) 结束。
+    chunk 内找不到足够的 | 或合法结尾的截断记录返回 None，被整体丢弃
+    """
+    p = buf.find(b'|', pos, end)
+    if p < 0:
+        return None
+    p = buf.find(b'|', p + 1, end)
+    if p < 0:
+        return None
+    # 描述从第二个 | 之后的第一个非空白字符开始，只占这一行
+    s = p + 1
+    while s < end and buf[s] in WHITESPACE:
+        s += 1
+    eol = buf.find(b'\n', s, end)
+    if eol < 0:
+        eol = end
+    k = buf.find(b')', s, eol)
+    while k >= 0 and not _closes_record(buf, k, end):
+        k = buf.find(b')', k + 1, eol)
+    if k < 0:
+        # 行内没有合法结尾时，) 可以出现在后面的行上，中间只能是空白
+        k = eol
+        while k < end and buf[k] in WHITESPACE:
+            k += 1
+        if k == end or buf[k] != CLOSE_PAREN or not _closes_record(buf, k, end):
+            return None
+    entity_name, entity_type, description = _decode(buf[pos:k]).split('|', 2)
+    return k + 1, (entity_name.strip(), entity_type.strip(), description.strip())
+
+
+def _parse_relationship_fields(buf, pos, end):
+    """
+    解析 ("relationship"|SRC|TGT|DESCRIPTION|WEIGHT|KEYWORDS) 的字段部分，不越过所在 chunk 的结束位置 end
+    
+    前四个字段不含 |（可以跨行），关键词截止到第一个 )，权重必须是整数。
+    chunk 内凑不齐四个 | 和结尾 ) 的截断记录返回 None，被整体丢弃
+    """
+    p = pos
+    for _ in range(4):
+        p = buf.find(b'|', p, end)
+        if p < 0:
+            return None
+        p += 1
+    k = buf.find(b')', p, end)
+    if k < 0:
+        return None
+    src_id, tgt_id, description, weight, keywords = _decode(buf[pos:k]).split('|', 4)
+    weight = weight.strip()
+    if not weight.isdecimal():
+        return None
+    return k + 1, (src_id.strip(), tgt_id.strip(), description.strip(), weight, keywords.strip())
+
+
+def _find_original_text(buf, start, end):
+    """
+    在 buf[start:end] 范围内提取原始文本，未找到时返回 None
+    """
+    pos = buf.find(ORIG_TEXT_MARKER, start, end)
+    if pos < 0:
+        return None
+    pos += len(ORIG_TEXT_MARKER)
+    # 逐个缩小截止位置，后面的查找只需扫描更短的范围
+    for terminator in ORIG_TEXT_TERMINATORS:
+        found = buf.find(terminator, pos, end)
+        if found >= 0:
+            end = found
+    return _decode(buf[pos:end]).strip()
+
+
+def _iter_records(buf, chunk_ranges):
+    """
+    依次扫描每个 chunk 的范围，定位实体/关系记录前缀并解析字段
+    
+    记录和字段查找都限制在所在 chunk 内，截断的记录不会吞掉下一个 chunk 的内容
+    
+    Args:
+        chunk_ranges: 按位置排序的 [(chunk 内容起点, chunk 结束位置), ...]
+    
+    Yields:
+        (记录类型 b"entity" 或 b"relationship", chunk 序号, 字段元组)
+    """
+    parsers = {b"entity": _parse_entity_fields, b"relationship": _parse_relationship_fields}
+    for idx, (start, end) in enumerate(chunk_ranges):
+        # 每类记录只从上一条同类记录的结尾之后继续匹配，与两类记录各扫一遍的结果一致；
+        # 每个 chunk 重新开始，坏记录不会影响后面的 chunk
+        resume = {b"entity": start, b"relationship": start}
+        m = RECORD_OPENER_RE.search(buf, start, end)
+        while m:
+            kind, pos = m.group(1), m.start()
+            if pos >= resume[kind]:
+                parsed = parsers[kind](buf, m.end(), end)
+                if parsed is not None:
+                    resume[kind], fields = parsed
+                    yield kind, idx, fields
+            m = RECORD_OPENER_RE.search(buf, pos + 1, end)
+
+
+def _new_kg_columns():
+    """
+    创建空的列式 KG 数据：每个字段一个列表，避免每条记录一个小字典
+    
+    Returns:
+        (entities, relationships, chunks)
+    """
+    entities = {"entity_name": [], "entity_type": [], "description": [], "source_id": []}
+    relationships = {
+        "src_id": [], "tgt_id": [], "description": [], "keywords": [], "weight": [], "source_id": [],
     }
+    chunks = {"content": [], "source_id": [], "source_chunk_index": []}
+    return entities, relationships, chunks
+
+
+def _parse_kg_buffer(buf, markers, end):
     """
-    with open(txt_path, 'r', encoding='utf-8') as f:
-        full_text = f.read()
+    在 UTF-8 字节缓冲区（bytes 或 mmap）上解析 markers 覆盖范围内的实体、关系和文本块
     
-    entities = []
-    relationships = []
-    chunks = []
+    Args:
+        buf: 整个文件的字节缓冲区
+        markers: 按位置排序的 chunk 分隔符 [(起点, 终点, chunk_id), ...]
+        end: 最后一个 chunk 的结束位置
     
-    # 找到所有 chunk 分隔符
-    chunk_pattern = r'No\.: (\d+) of all the chunks'
-    matches = list(re.finditer(chunk_pattern, full_text))
+    Returns:
+        (entities, relationships, chunks)
+    """
+    entities, relationships, chunks = _new_kg_columns()
+    if not markers:
+        return entities, relationships, chunks
     
-    logger.info(f"找到 {len(matches)} 个 chunks")
+    # 取值集合很小的字段（source_id、实体类型、关键词）经本次解析的共享表去重，
+    # 相同取值的记录共享同一个字符串对象；描述、实体名等基本唯一的字段不做处理
+    pool = {}
+    dedup = pool.setdefault
     
-    # 处理每个 chunk
-    for idx, match in enumerate(matches):
-        chunk_id = match.group(1)
+    # 每个 chunk 的内容范围：分隔符之后到下一个分隔符（或 end）之前
+    chunk_ranges = [
+        (content_start, markers[idx + 1][0] if idx + 1 < len(markers) else end)
+        for idx, (_, content_start, _) in enumerate(markers)
+    ]
+    # 每个 chunk 的 source_id 只构造一次，所有记录共享同一个字符串对象
+    source_ids = []
+    for _, _, chunk_id in markers:
         source_id = f"chunk_{chunk_id}"
+        source_ids.append(dedup(source_id, source_id))
+    
+    # 处理每个 chunk 的原始文本
+    for idx, (start_pos, end_pos) in enumerate(chunk_ranges):
+        # 不切片，直接在全文上检查 chunk 内容范围
+        chunk_id = markers[idx][2]
         
-        # 确定 chunk 内容范围
-        start_pos = match.end()
-        end_pos = matches[idx + 1].start() if idx + 1 < len(matches) else len(full_text)
-        
-        # 提取 chunk 文本
-        chunk_text = full_text[start_pos:end_pos].strip()
-        
-        if not chunk_text:
+        if not NON_BLANK_RE.search(buf, start_pos, end_pos):
             logger.warning(f"Chunk {chunk_id} 内容为空，跳过")
             continue
         
-        # 提取原始文本
-        original_text_match = re.search(
-            r'original text:\s*(.*?)(?=total tokens:|deepseek-v3 output:|$)', 
-            chunk_text, 
-            re.DOTALL
-        )
-        
-        if original_text_match:
-            original_text = original_text_match.group(1).strip()
-            chunks.append({
-                "content": original_text,
-                "source_id": source_id,
-                "source_chunk_index": int(chunk_id),
-            })
+        original_text = _find_original_text(buf, start_pos, end_pos)
+        if original_text is not None:
+            chunks["content"].append(original_text)
+            chunks["source_id"].append(source_ids[idx])
+            chunks["source_chunk_index"].append(int(chunk_id))
             logger.info(f"  ✓ Chunk {chunk_id}: {len(original_text)} 字符")
         else:
             logger.warning(f"  ✗ Chunk {chunk_id}: 未找到原始文本")
-        
-        # 提取实体
-        entity_pattern = r'\("entity"\s*\|\s*([^|]*?)\s*\|\s*([^|]*?)\s*\|\s*(.*?)\s*\)(?=\s*$|\s*\()'
-        entity_matches = re.findall(entity_pattern, chunk_text, re.MULTILINE)
-        
-        for entity_name, entity_type, description in entity_matches:
-            entities.append({
-                "entity_name": entity_name.strip(),
-                "entity_type": entity_type.strip(),
-                "description": description.strip(),
-                "source_id": source_id,
-            })
-        
-        # 提取关系（带关键词）
-        # 格式: ("relationship"|SRC|TGT|DESCRIPTION|WEIGHT|KEYWORDS)
-        relation_pattern = r'\("relationship"\s*\|\s*([^|]*?)\s*\|\s*([^|]*?)\s*\|\s*([^|]*?)\s*\|\s*(\d+)\s*\|\s*([^)]*?)\s*\)'
-        relation_matches = re.findall(relation_pattern, chunk_text, re.MULTILINE)
-        
-        for src_id, tgt_id, description, weight, keywords in relation_matches:
-            relationships.append({
-                "src_id": src_id.strip(),
-                "tgt_id": tgt_id.strip(),
-                "description": description.strip(),
-                "keywords": keywords.strip(),
-                "weight": float(weight),
-                "source_id": source_id,
-            })
+    
+    # 提取实体和关系（带关键词）
+    # 热循环中预先绑定各列的 append，省去每个字段一次字典查找和属性查找
+    add_entity_name, add_entity_type, add_entity_description, add_entity_source = (
+        column.append for column in entities.values()
+    )
+    add_src, add_tgt, add_rel_description, add_keywords, add_weight, add_rel_source = (
+        column.append for column in relationships.values()
+    )
+    
+    for kind, idx, fields in _iter_records(buf, chunk_ranges):
+        if kind == b"entity":
+            entity_name, entity_type, description = fields
+            add_entity_name(entity_name)
+            add_entity_type(dedup(entity_type, entity_type))
+            add_entity_description(description)
+            add_entity_source(source_ids[idx])
+        else:
+            src_id, tgt_id, description, weight, keywords = fields
+            add_src(src_id)
+            add_tgt(tgt_id)
+            add_rel_description(description)
+            add_keywords(dedup(keywords, keywords))
+            add_weight(float(weight))
+            add_rel_source(source_ids[idx])
+    
+    return entities, relationships, chunks
+
+
+def _parse_kg_span(txt_path, markers, end):
+    """
+    子进程入口：重新映射文件，只解析 markers 覆盖的范围
+    """
+    with open(txt_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+        return _parse_kg_buffer(buf, markers, end)
+
+
+def _parse_kg_parallel(txt_path, markers, end, max_workers):
+    """
+    将连续的 chunk 分组后交给进程池并行解析，按原顺序合并各组的列式结果
+    
+    记录解析被限制在各自的 chunk 内（见 _iter_records），分组边界总落在 chunk 分隔符上，
+    因此结果与 max_workers=1 的顺序解析完全一致
+    """
+    # 分组数取进程数的若干倍，平衡各进程的负载
+    num_groups = min(len(markers), max_workers * 4)
+    group_size = -(-len(markers) // num_groups)
+    groups = [markers[i:i + group_size] for i in range(0, len(markers), group_size)]
+    group_ends = [group[0][0] for group in groups[1:]] + [end]
+    
+    merged = _new_kg_columns()
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        for part in executor.map(_parse_kg_span, repeat(txt_path), groups, group_ends):
+            for columns, part_columns in zip(merged, part):
+                for key, values in part_columns.items():
+                    columns[key].extend(values)
+    return merged
+
+
+def parse_kg_from_txt(txt_path, max_workers=None):
+    """
+    从 TXT 文件中解析知识图谱数据（包含关键词的关系）
+    
+    各 chunk 相互独立，大文件按 chunk 分组用多进程并行解析
+    
+    Args:
+        txt_path: TXT 文件路径
+        max_workers: 并行解析的进程数，None 则使用 CPU 核数，1 则在当前进程解析
+    
+    返回格式（列式，每个字段一个等长列表，可用 _rows 转为逐条字典）：
+    {
+        "entities": {"entity_name": [...], "entity_type": [...], "description": [...], "source_id": [...]},
+        "relationships": {"src_id": [...], "tgt_id": [...], "description": [...], "keywords": [...], "weight": [...], "source_id": [...]},
+        "chunks": {"content": [...], "source_id": [...], "source_chunk_index": [...]}
+    }
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    
+    with open(txt_path, 'rb') as f:
+        file_size = os.fstat(f.fileno()).st_size
+        # 内存映射文件：由操作系统按需分页，直接在原始字节上解析，不整体解码（空文件无法 mmap）
+        buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if file_size else b''
+        try:
+            # 找到所有 chunk 分隔符
+            markers = [
+                (m.start(), m.end(), m.group(1).decode('ascii'))
+                for m in CHUNK_RE.finditer(buf)
+            ]
+            logger.info(f"找到 {len(markers)} 个 chunks")
+            
+            if max_workers > 1 and len(markers) > 1 and file_size >= PARALLEL_MIN_FILE_SIZE:
+                entities, relationships, chunks = _parse_kg_parallel(
+                    txt_path, markers, file_size, max_workers
+                )
+            else:
+                entities, relationships, chunks = _parse_kg_buffer(buf, markers, file_size)
+        finally:
+            if file_size:
+                buf.close()
     
     logger.info(f"解析完成:")
-    logger.info(f"  - 实体数量: {len(entities)}")
-    logger.info(f"  - 关系数量: {len(relationships)}")
-    logger.info(f"  - 文本块数量: {len(chunks)}")
+    logger.info(f"  - 实体数量: {_num_rows(entities)}")
+    logger.info(f"  - 关系数量: {_num_rows(relationships)}")
+    logger.info(f"  - 文本块数量: {_num_rows(chunks)}")
     
     # 验证数据完整性
     validate_kg_data(entities, relationships, chunks)
@@ -122,40 +338,55 @@ def parse_kg_from_txt(txt_path):
         "chunks": chunks,
     }
 
+def _num_rows(columns):
+    """列式数据的记录数"""
+    return len(next(iter(columns.values())))
+
+def _row(columns, idx):
+    """取列式数据中的第 idx 条记录"""
+    return {key: values[idx] for key, values in columns.items()}
+
+def _rows(columns):
+    """将列式数据转换为逐条字典（LightRAG.insert_custom_kg 需要的格式）"""
+    keys = list(columns)
+    return [dict(zip(keys, values)) for values in zip(*columns.values())]
+
 def validate_kg_data(entities, relationships, chunks):
     """
     验证 KG 数据的完整性
     """
-    # 检查实体
-    entity_names = set()
-    for entity in entities:
-        if not entity.get("entity_name"):
-            logger.error(f"发现空实体名称: {entity}")
-            raise ValueError("Entity name cannot be empty")
-        if not entity.get("entity_type"):
-            logger.error(f"发现空实体类型: {entity}")
-            raise ValueError("Entity type cannot be empty")
-        entity_names.add(entity["entity_name"])
+    # 检查实体：直接对实体名列建集合，只有发现空值时才逐条定位出错的实体
+    entity_names = set(entities["entity_name"])
+    if "" in entity_names or not all(entities["entity_type"]):
+        for entity in _rows(entities):
+            if not entity["entity_name"]:
+                logger.error(f"发现空实体名称: {entity}")
+                raise ValueError("Entity name cannot be empty")
+            if not entity["entity_type"]:
+                logger.error(f"发现空实体类型: {entity}")
+                raise ValueError("Entity type cannot be empty")
     
     logger.info(f"  ✓ 实体验证通过: {len(entity_names)} 个唯一实体")
     
-    # 检查关系
+    # 检查关系：并行遍历需要的几列
     missing_entities = set()
-    for rel in relationships:
-        if not rel.get("src_id"):
-            logger.error(f"发现空源节点: {rel}")
+    for idx, (src_id, tgt_id, keywords) in enumerate(
+        zip(relationships["src_id"], relationships["tgt_id"], relationships["keywords"])
+    ):
+        if not src_id:
+            logger.error(f"发现空源节点: {_row(relationships, idx)}")
             raise ValueError("Source ID cannot be empty")
-        if not rel.get("tgt_id"):
-            logger.error(f"发现空目标节点: {rel}")
+        if not tgt_id:
+            logger.error(f"发现空目标节点: {_row(relationships, idx)}")
             raise ValueError("Target ID cannot be empty")
-        if not rel.get("keywords"):
-            logger.warning(f"关系缺少关键词: {rel['src_id']} -> {rel['tgt_id']}")
+        if not keywords:
+            logger.warning(f"关系缺少关键词: {src_id} -> {tgt_id}")
         
         # 检查关系引用的实体是否存在
-        if rel["src_id"] not in entity_names:
-            missing_entities.add(rel["src_id"])
-        if rel["tgt_id"] not in entity_names:
-            missing_entities.add(rel["tgt_id"])
+        if src_id not in entity_names:
+            missing_entities.add(src_id)
+        if tgt_id not in entity_names:
+            missing_entities.add(tgt_id)
     
     if missing_entities:
         logger.warning(f"  ⚠ 关系引用了 {len(missing_entities)} 个未定义的实体:")
@@ -167,15 +398,59 @@ def validate_kg_data(entities, relationships, chunks):
         logger.info(f"  ✓ 关系验证通过: 所有实体都已定义")
     
     # 检查文本块
-    if not chunks:
+    if not _num_rows(chunks):
         logger.error("没有找到任何文本块")
         raise ValueError("No chunks found")
     
-    logger.info(f"  ✓ 文本块验证通过: {len(chunks)} 个文本块")
+    logger.info(f"  ✓ 文本块验证通过: {_num_rows(chunks)} 个文本块")
 
-def insert_kg_to_lightrag(kg_data, working_dir):
+def _shard_kg(kg_data, batch_size=None):
     """
-    将解析的 KG 数据插入到 LightRAG
+    按 source_id 将列式 KG 数据分批，生成 insert_custom_kg 需要的逐条字典格式
+    
+    同一 chunk 的文本块、实体和关系总在同一批中，保证 source_id 能映射到本批的文本块；
+    累计的实体和关系数达到 batch_size 后输出一批。batch_size 为 None 时整体作为一批
+    """
+    if batch_size is None:
+        yield {key: _rows(columns) for key, columns in kg_data.items()}
+        return
+    
+    # 记录每个 source_id 在各类数据中的行号，按首次出现的顺序分组
+    groups = {}
+    for key in ("chunks", "entities", "relationships"):
+        for idx, source_id in enumerate(kg_data[key]["source_id"]):
+            group = groups.setdefault(source_id, {"chunks": [], "entities": [], "relationships": []})
+            group[key].append(idx)
+    
+    batch = {"chunks": [], "entities": [], "relationships": []}
+    batch_records = 0
+    for group in groups.values():
+        for key, indices in group.items():
+            batch[key].extend(indices)
+        batch_records += len(group["entities"]) + len(group["relationships"])
+        
+        if batch_records >= batch_size:
+            yield {key: [_row(kg_data[key], idx) for idx in indices] for key, indices in batch.items()}
+            batch = {"chunks": [], "entities": [], "relationships": []}
+            batch_records = 0
+    
+    if any(batch.values()):
+        yield {key: [_row(kg_data[key], idx) for idx in indices] for key, indices in batch.items()}
+
+def insert_kg_to_lightrag(kg_data, working_dir, batch_size=None):
+    """
+    将解析的 KG 数据插入到 LightRAG，可选分批
+    
+    注意：insert_custom_kg 每次调用结束都会执行 _insert_done()，把所有存储（KV JSON、
+    向量库文件、graphml）完整重写到磁盘，且存储始终全部驻留内存。分批不会降低峰值内存，
+    磁盘写入量约为 批次数 × KG 总大小；关系端点若定义在后面的批次，会先生成 UNKNOWN
+    占位节点再被覆盖。因此默认整体插入一次，只有需要缩小单次 embedding/upsert 调用时才分批，
+    并应使用足够大的 batch_size 让批次数保持很少。
+    
+    Args:
+        kg_data: parse_kg_from_txt 返回的列式 KG 数据
+        working_dir: LightRAG 工作目录
+        batch_size: 每批插入的实体和关系数量（按 chunk 整体分批，可能略有超出），None 则不分批
     """
     logger.info("\n初始化 LightRAG...")
     
@@ -188,7 +463,13 @@ def insert_kg_to_lightrag(kg_data, working_dir):
     logger.info("✓ LightRAG 初始化完成")
     
     logger.info("\n插入知识图谱...")
-    rag.insert_custom_kg(kg_data)
+    # 分批时每次 embedding/upsert 调用的数据量更小；每批结束都会完整持久化一次所有存储
+    for batch_idx, shard in enumerate(_shard_kg(kg_data, batch_size), start=1):
+        rag.insert_custom_kg(shard)
+        logger.info(
+            f"  ✓ 批次 {batch_idx}: {len(shard['chunks'])} 个文本块, "
+            f"{len(shard['entities'])} 个实体, {len(shard['relationships'])} 个关系"
+        )
     logger.info("✓ 知识图谱插入完成")
     
     # 输出存储信息
@@ -209,9 +490,9 @@ if __name__ == "__main__":
         
         # 显示统计信息
         print(f"\n解析结果:")
-        print(f"  ├─ 实体: {len(kg_data['entities'])} 个")
-        print(f"  ├─ 关系: {len(kg_data['relationships'])} 个")
-        print(f"  └─ 文本块: {len(kg_data['chunks'])} 个")
+        print(f"  ├─ 实体: {_num_rows(kg_data['entities'])} 个")
+        print(f"  ├─ 关系: {_num_rows(kg_data['relationships'])} 个")
+        print(f"  └─ 文本块: {_num_rows(kg_data['chunks'])} 个")
         
         
         # 步骤 2: 插入到 LightRAG
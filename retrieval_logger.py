@@ -1,13 +1,44 @@
 import json
 import time
+import weakref
+from collections import Counter
 from pathlib import Path
-from typing import Any, Dict, List, Optional
-from dataclasses import dataclass, asdict
+from typing import Any, Dict, Iterator, List, Optional, Union
+from dataclasses import dataclass
 import logging
 
+try:
+    import orjson
+except ImportError:  # 未安装 orjson 时回退到标准库 json
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
 
+def _iter_entries(file_path: Path) -> Iterator[Dict[str, Any]]:
+    """
+    逐行解析 JSONL 日志文件，依次返回每条记录的原始字典
+    
+    优先使用 orjson 解析；orjson 不接受 NaN / Infinity，而标准库 json 写出的日志
+    （log_retrieval 的回退路径、operate._update_last_log_with_response）可能包含它们，
+    此时该行改用 json.loads 重新解析
+    
+    Args:
+        file_path: 日志文件路径
+    """
+    with open(file_path, 'rb') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            if orjson is not None:
+                try:
+                    yield orjson.loads(line)
+                    continue
+                except orjson.JSONDecodeError:
+                    pass
+            yield json.loads(line)
+
+
 @dataclass
 class RetrievalResult:
     """存储单次检索的完整结果"""
@@ -50,52 +81,83 @@ class RetrievalLogger:
         self.session_id = int(time.time())
         self.log_file = self.log_dir / f"retrieval_log_{self.session_id}.jsonl"
         
+        # 日志文件句柄在首次写入时打开并保持，避免每条记录都 open/close
+        self._fh = None
+        self._fh_finalizer = None
+        
         logger.info(f"RetrievalLogger initialized. Log file: {self.log_file}")
     
     def log_retrieval(self, retrieval_result: RetrievalResult) -> None:
         """
         记录单次检索结果到JSONL文件
         
+        每条记录写入后立即 flush 到操作系统，进程崩溃不会丢失已记录的条目，其他进程也能立即读到；
+        省去的只是每条记录的 open/close（不做 fsync，断电时仍可能丢失最近的记录）
+        
         Args:
             retrieval_result: 检索结果对象
         """
         try:
-            # 转换为字典
-            result_dict = asdict(retrieval_result)
+            # 直接使用实例字典（序列化器会递归处理嵌套结构，无需 asdict 深拷贝）
+            result_dict = retrieval_result.__dict__
+            
+            # 编码为 UTF-8 字节（优先使用 orjson）
+            if orjson is not None:
+                payload = orjson.dumps(result_dict, option=orjson.OPT_NON_STR_KEYS)
+            else:
+                payload = json.dumps(result_dict, ensure_ascii=False).encode('utf-8')
             
-            # 写入JSONL文件（每行一个JSON对象）
-            with open(self.log_file, 'a', encoding='utf-8') as f:
-                json.dump(result_dict, f, ensure_ascii=False)
-                f.write('\n')
+            # 写入JSONL文件（每行一个JSON对象，一次 write 完成）
+            if self._fh is None:
+                self._fh = open(self.log_file, 'ab')
+                # 只弱引用 logger：logger 被回收或解释器退出时关闭句柄
+                self._fh_finalizer = weakref.finalize(self, self._fh.close)
+            self._fh.write(payload + b'\n')
+            self._fh.flush()
             
             logger.debug(f"Logged retrieval result for query: {retrieval_result.query[:50]}...")
             
         except Exception as e:
             logger.error(f"Failed to log retrieval result: {e}")
     
-    def load_logs(self, log_file: Optional[str] = None) -> List[RetrievalResult]:
+    def flush(self) -> None:
+        """将缓冲区中的日志写入磁盘"""
+        if self._fh is not None:
+            self._fh.flush()
+    
+    def close(self) -> None:
+        """关闭日志文件句柄"""
+        if self._fh is not None:
+            self._fh_finalizer()
+            self._fh = None
+            self._fh_finalizer = None
+    
+    def load_logs(
+        self, log_file: Optional[str] = None, raw: bool = False
+    ) -> List[Union[RetrievalResult, Dict[str, Any]]]:
         """
         加载日志文件中的检索结果
         
         Args:
             log_file: 指定日志文件路径，None则使用当前会话的日志
+            raw: 为 True 时直接返回解析出的字典，跳过 RetrievalResult 构造
             
         Returns:
             检索结果列表
         """
         file_path = Path(log_file) if log_file else self.log_file
         
+        # 读取前先落盘，保证能读到本会话刚写入的记录
+        self.flush()
+        
         if not file_path.exists():
             logger.warning(f"Log file not found: {file_path}")
             return []
         
         results = []
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                for line in f:
-                    if line.strip():
-                        result_dict = json.loads(line)
-                        results.append(RetrievalResult(**result_dict))
+            for result_dict in _iter_entries(file_path):
+                results.append(result_dict if raw else RetrievalResult(**result_dict))
             
             logger.info(f"Loaded {len(results)} retrieval results from {file_path}")
             return results
@@ -113,8 +175,6 @@ class RetrievalLogger:
         """
         # 🔥 新增：如果没有指定 log_file，则读取整个目录的所有 JSONL 文件
         if log_file is None:
-            all_results = []
-            
             # 获取目录中所有 .jsonl 文件
             jsonl_files = sorted(self.log_dir.glob("retrieval_log_*.jsonl"))
             
@@ -124,30 +184,43 @@ class RetrievalLogger:
             
             logger.info(f"Found {len(jsonl_files)} JSONL files to export")
             
-            # 依次读取每个 JSONL 文件
-            for jsonl_file in jsonl_files:
-                logger.info(f"Reading {jsonl_file.name}...")
-                results = self.load_logs(str(jsonl_file))
-                all_results.extend(results)
-            
-            logger.info(f"Total loaded: {len(all_results)} retrieval results")
-            
         else:
             # 如果指定了 log_file，只读取该文件（保持原有功能）
-            all_results = self.load_logs(log_file)
+            jsonl_files = [Path(log_file)]
+        
+        # 确保本会话已写入的记录落盘
+        self.flush()
         
         try:
             # 🔥 确保输出文件的父目录存在
             output_path = Path(output_file)
             output_path.parent.mkdir(parents=True, exist_ok=True)
             
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump([asdict(r) for r in all_results], f, ensure_ascii=False, indent=2)
+            # 流式拼接：JSONL 的每一行本身就是合法 JSON，原样写入数组，无需解析再编码
+            count = 0
+            with open(output_file, 'wb') as out:
+                out.write(b'[')
+                for jsonl_file in jsonl_files:
+                    if not jsonl_file.exists():
+                        logger.warning(f"Log file not found: {jsonl_file}")
+                        continue
+                    
+                    logger.info(f"Reading {jsonl_file.name}...")
+                    with open(jsonl_file, 'rb') as f:
+                        for line in f:
+                            line = line.strip()
+                            if not line:
+                                continue
+                            if count:
+                                out.write(b',\n')
+                            out.write(line)
+                            count += 1
+                out.write(b']\n')
             
-            logger.info(f"✅ Exported {len(all_results)} results to {output_file}")
+            logger.info(f"✅ Exported {count} results to {output_file}")
             
         except Exception as e:
-            logger.error(f"Failed to export to {output_file}: {e}")    
+            logger.error(f"Failed to export to {output_file}: {e}")
     
     def get_statistics(self, log_file: Optional[str] = None) -> Dict[str, Any]:
         """
@@ -159,41 +232,52 @@ class RetrievalLogger:
         Returns:
             统计信息字典
         """
-        results = self.load_logs(log_file)
+        file_path = Path(log_file) if log_file else self.log_file
         
-        if not results:
-            return {}
+        # 读取前先落盘，保证能统计到本会话刚写入的记录
+        self.flush()
         
-        stats = {
-            "total_queries": len(results),
-            "mode_distribution": {},
-            "avg_entities_per_query": 0,
-            "avg_relationships_per_query": 0,
-            "avg_chunks_per_query": 0,
-            "queries_with_no_results": 0,
-        }
+        if not file_path.exists():
+            logger.warning(f"Log file not found: {file_path}")
+            return {}
         
+        # 逐行流式统计，只读取需要的字段，不构造 RetrievalResult 也不保留条目
+        mode_counter = Counter()
         total_entities = 0
         total_relationships = 0
         total_chunks = 0
+        queries_with_no_results = 0
         
-        for result in results:
-            # 模式分布
-            mode = result.query_mode
-            stats["mode_distribution"][mode] = stats["mode_distribution"].get(mode, 0) + 1
-            
-            # 累计数量
-            total_entities += len(result.entities)
-            total_relationships += len(result.relationships)
-            total_chunks += len(result.text_chunks)
-            
-            # 空结果查询
-            if (not result.entities and not result.relationships and not result.text_chunks):
-                stats["queries_with_no_results"] += 1
+        try:
+            for entry in _iter_entries(file_path):
+                mode_counter[entry["query_mode"]] += 1
+                
+                num_entities = len(entry["entities"])
+                num_relationships = len(entry["relationships"])
+                num_chunks = len(entry["text_chunks"])
+                total_entities += num_entities
+                total_relationships += num_relationships
+                total_chunks += num_chunks
+                
+                # 空结果查询
+                if not (num_entities or num_relationships or num_chunks):
+                    queries_with_no_results += 1
+                    
+        except Exception as e:
+            logger.error(f"Failed to load logs from {file_path}: {e}")
+            return {}
         
-        # 计算平均值
-        stats["avg_entities_per_query"] = total_entities / len(results)
-        stats["avg_relationships_per_query"] = total_relationships / len(results)
-        stats["avg_chunks_per_query"] = total_chunks / len(results)
+        total_queries = sum(mode_counter.values())
+        if not total_queries:
+            return {}
         
-        return stats
\ No newline at end of file
+        return {
+            "total_queries": total_queries,
+            # 模式分布
+            "mode_distribution": dict(mode_counter),
+            # 平均值
+            "avg_entities_per_query": total_entities / total_queries,
+            "avg_relationships_per_query": total_relationships / total_queries,
+            "avg_chunks_per_query": total_chunks / total_queries,
+            "queries_with_no_results": queries_with_no_results,
+        }